@@ -1,15 +1,48 @@
-import requests
-from collections import Iterable
-import multiprocessing
+import aiohttp
+import asyncio
+import concurrent.futures
+import eccodes
+import functools
+from multiprocessing import shared_memory
+import queue
+import threading
 from datetime import datetime, timezone, timedelta
-from bz2 import decompress
-import xarray as xr
+from bz2 import BZ2Decompressor
+import hashlib
+import json
 import pandas as pd
 import os
-import glob
-from pathlib import Path
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel = True, cache = True)
+    def _gather(values2d, flatIdx, out):
+
+        '''Gathers the location cells out of the stacked message
+        values, parallelized over the steps. Compiled on first use and
+        cached on disk by numba.
+        '''
+
+        for s in prange(values2d.shape[0]):
+            for p in range(flatIdx.size):
+                out[s, p] = values2d[s, flatIdx[p]]
+
+else:
+
+    def _gather(values2d, flatIdx, out):
+
+        '''Numpy fallback of the gather when numba is not installed.
+        '''
+
+        out[:] = values2d[:, flatIdx]
+
 
 class ICON_D2:
 
@@ -25,19 +58,24 @@ class ICON_D2:
                 
                 variables = ["aswdir_s", "aswdifd_s", "t_2m"]
                 
-    forecastHours : int
-        The forecast hours for which the data is collected
+    forecastHours : int or tuple
+        The forecast hours for which the data is collected. Either the
+        number of hours counted from the run init, or an (hourLo,
+        hourHi) window so leading hours that are not needed, e.g. for
+        a route starting in the future, are never downloaded.
     run : string
         The name of the run to load forecast. Possible values: 
         "00", "03", "06" ... "18", "21", "23" 
     tmpFp : string
-        The filepath to a folder where temporary files will be stored. This 
-        is needed to extract data from grib2 files because with the used 
-        libraries (eccodes, cfgrib) it is not possible to store the downloaded 
-        grib files in memory (see https://github.com/ecmwf/cfgrib/issues/99 or 
-                              https://github.com/ecmwf/eccodes-python/issues/25).
-        If no path is given a default directory "tmp/icond2/" will be created.
-        
+        Unused. The grib files are decompressed and decoded in memory,
+        so no temporary files are written anymore. The parameter is
+        kept for backward compatibility.
+    cacheFp : string
+        The filepath to a folder where already extracted values are cached
+        per run, variable and forecast hour. Subsequent calls within the
+        same run skip the download and grib decoding entirely. If no path
+        is given a default directory "tmp/icond2/cache/" will be created.
+
     Properties
     ----------
     locations : dict
@@ -48,24 +86,90 @@ class ICON_D2:
         The hours as string of the current run
     currentRunDateTime : datetime
         The init datetime of the current run
-    '''   
+    '''
 
-    def __init__(self, locations, forecastHours, run = None, tmpFp = None):
-        
-        if tmpFp is None:
-            
-            p = "tmp/icond2/"
-            
-            self._tmpFp = p
-            
-            if not os.path.exists(p):
-                os.makedirs(p)
-            
+    # The ICON D2 grid definition is identical for every run and
+    # instance, so it is cached per process.
+    _gridMeta = None
+
+    # Process wide defaults and setup state shared by all instances,
+    # so per request construction stays cheap.
+    _initialized = False
+    _defaultCacheFp = "tmp/icond2/cache/"
+
+    # Cache entries older than this are dropped on initialisation;
+    # they belong to runs that are no longer published.
+    _cacheMaxAgeDays = 2
+
+    @classmethod
+    def _pruneCache(cls):
+
+        '''Removes outdated cache entries. A single scan over the
+        cache folder instead of per file bookkeeping during the
+        collection.
+        '''
+
+        cutoff = datetime.now().timestamp() - cls._cacheMaxAgeDays * 86400
+
+        try:
+            with os.scandir(cls._defaultCacheFp) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except Exception as err:
+            print("Could not prune cache folder: {err}".format(err = err))
+
+    @classmethod
+    def ensureInitialized(cls, tmpFp = None, cacheFp = None):
+
+        '''Prepares the process wide state once: creates the cache
+        folder, drops outdated cache entries and loads the eccodes
+        library tables. Safe to call repeatedly. Long running
+        consumers, e.g. a web service, should call this once at
+        startup so the first request does not pay the setup cost; the
+        given cache path becomes the default for instances constructed
+        without an explicit path.
+
+        Parameters
+        ----------
+        tmpFp : string
+            Unused, kept for backward compatibility
+        cacheFp : string
+            The default filepath for the cache
+        '''
+
+        if cls._initialized and cacheFp in (None, cls._defaultCacheFp):
+            return
+
+        if cacheFp is not None:
+            cls._defaultCacheFp = cacheFp
+
+        os.makedirs(cls._defaultCacheFp, exist_ok = True)
+
+        cls._pruneCache()
+
+        _initEccodesWorker()
+
+        cls._initialized = True
+
+    def __init__(self, locations, forecastHours, run = None, tmpFp = None, cacheFp = None):
+
+        '''An explicit cacheFp only applies to this instance; the
+        process wide default is changed solely by a direct call to
+        ensureInitialized at startup.
+        '''
+
+        self.ensureInitialized(tmpFp)
+
+        if cacheFp is not None:
+            self._cacheFp = cacheFp
+            os.makedirs(cacheFp, exist_ok = True)
         else:
-            self._tmpFp = tmpFp
-        
+            self._cacheFp = self._defaultCacheFp
+
         self._forecastHours = forecastHours
         self._locations = locations
+        self._flatIdx = None
         self._src = "https://opendata.dwd.de/weather/nwp/icon-d2/grib/"
         
         if run is None:
@@ -89,48 +193,296 @@ class ICON_D2:
         return self._currentRun 
     
     
+    # The run that is fully available at each utc hour. A run is
+    # complete ~2h after initialisation, e.g. the 09 run is finished
+    # at approx 11:00 UTC.
+    _RUN_BY_HOUR = ("21", "21", "00", "00", "00", "03", "03", "03",
+                    "06", "06", "06", "09", "09", "09", "12", "12",
+                    "12", "15", "15", "15", "18", "18", "18", "21")
+
     def _getCurrentRun(self, now_utc):
-        
-        '''Gets the number of the current run by current time. 
-        The latest run is fully available ~2h after initialisation.
-        e.g. The 09 run will be finished at approx 11:00 UTC.
-        
+
+        '''Gets the number of the current run by current time via a
+        single table lookup on the hour.
+
         Parameters
         ----------
         now_utc : datetime
             The current datetime
-            
+
         Returns
         -------
         string
             The run hour as a string (00, 03, 06 ...)
         '''
-        
-        h = now_utc.hour
-        run_hour = "00"
-        
-        if h >= 2:
-            run_hour = "00"        
-        if h >= 5:
-            run_hour = "03"
-        if h >= 8:
-            run_hour = "06"        
-        if h >= 11:
-            run_hour = "09"
-        if h >= 14:
-            run_hour = "12"
-        if h >= 17:
-            run_hour = "15"
-        if h >= 20:
-            run_hour = "18"            
-        if h >= 24 or h < 2:
-            run_hour = "21"
-        
-        self._currentRun = run_hour     
-        
+
+        run_hour = self._RUN_BY_HOUR[now_utc.hour]
+
+        self._currentRun = run_hour
+
         return run_hour
     
             
+    def _runInitDatetime(self):
+
+        '''Gets the init datetime of the current run, from which the
+        forecast hours count.
+
+        Returns
+        -------
+        np.datetime64
+            The init datetime of the current run
+        '''
+
+        dtStr = "{ds}{run}".format(ds = self._getRunDate(), run = self._currentRun)
+
+        return np.datetime64(datetime.strptime(dtStr, "%Y%m%d%H"), 's')
+
+
+    def forecastHoursFromTimes(self, times):
+
+        '''Computes the number of forecast hours needed to cover the
+        given times, e.g. the waypoint times of a route. Forecast
+        hours count from the run init, which lies a few hours before
+        the current time, so the horizon is computed against the init
+        datetime of the instance's run. The times are parsed into one
+        numpy datetime array instead of allocating a python datetime
+        object per entry, which matters for many hundred points.
+        The result is also assigned to the instance, so subsequent
+        collectData calls use it.
+
+        Parameters
+        ----------
+        times : list
+            The times as naive iso formatted strings in UTC
+
+        Returns
+        -------
+        int
+            The number of forecast hours
+        '''
+
+        parsed = np.array(times, dtype = 'datetime64[s]')
+        ref = self._runInitDatetime()
+
+        hours = int(np.ceil((parsed.max() - ref) / np.timedelta64(3600, 's')))
+
+        self._forecastHours = min(max(hours + 1, 1), 49)
+
+        return self._forecastHours
+
+
+    def forecastWindowFromTimes(self, times):
+
+        '''Computes the (hourLo, hourHi) forecast window covering the
+        given times. Unlike forecastHoursFromTimes this skips the
+        hours before the first time entirely. Both bounds are measured
+        from the init datetime of the instance's run, since forecast
+        hours count from the run init and not from the current time.
+        The result is also assigned to the instance, so subsequent
+        collectData calls use it.
+
+        Parameters
+        ----------
+        times : list
+            The times as naive iso formatted strings in UTC
+
+        Returns
+        -------
+        tuple
+            The first and (exclusive) last forecast hour
+        '''
+
+        parsed = np.array(times, dtype = 'datetime64[s]')
+        ref = self._runInitDatetime()
+
+        hourLo = int(np.floor((parsed.min() - ref) / np.timedelta64(3600, 's')))
+        hourHi = int(np.ceil((parsed.max() - ref) / np.timedelta64(3600, 's'))) + 1
+
+        hourLo = min(max(hourLo, 0), 48)
+        hourHi = min(max(hourHi, hourLo + 1), 49)
+
+        self._forecastHours = (hourLo, hourHi)
+
+        return self._forecastHours
+
+
+    def _forecastWindow(self):
+
+        '''Resolves the configured forecast hours into the (first,
+        exclusive last) hour window.
+
+        Returns
+        -------
+        tuple
+            The first and (exclusive) last forecast hour
+        '''
+
+        hours = self._forecastHours
+
+        if hours is None:
+            return 0, 49
+
+        if isinstance(hours, (tuple, list)):
+            hourLo, hourHi = hours
+            return max(int(hourLo), 0), int(hourHi)
+
+        return 0, int(hours)
+
+
+    def _getRunDate(self):
+
+        '''Gets the date string of the current run.
+
+        Returns
+        -------
+        string
+            The run date as "YYYYMMDD"
+        '''
+
+        now_utc = datetime.now(timezone.utc)
+
+        # Only the early morning hours still use the 21 run of the
+        # previous day. From 23:xx on the 21 run of the current day is
+        # complete, so the date must not be shifted there.
+        if self._currentRun == "21" and now_utc.hour < 2:
+            now_utc = now_utc - timedelta(days=1)
+
+        return now_utc.strftime("%Y%m%d")
+
+
+    def _createCacheFp(self, var, hStr, locations):
+
+        '''Creates the cache filepath for one run, variable and
+        forecast hour. The requested locations are part of the key
+        because the cache stores the already extracted point values.
+
+        Parameters
+        ----------
+        var : string
+            The variable name
+        hStr : string
+            The forecast hour as a zero padded string
+        locations : dict
+            The locations the values are extracted for
+
+        Returns
+        -------
+        string
+            The filepath of the cache file
+        '''
+
+        locKey = repr(sorted(locations.items()))
+        key = "{ds}{run}{var}{h}{loc}".format(ds = self._getRunDate(),
+                                              run = self._currentRun,
+                                              var = var,
+                                              h = hStr,
+                                              loc = locKey)
+        cacheKey = hashlib.blake2b(key.encode()).hexdigest()
+
+        return "{p}/{key}.npz".format(p = self._cacheFp, key = cacheKey)
+
+
+    def _readCache(self, cacheFp):
+
+        '''Reads one cached file.
+
+        Parameters
+        ----------
+        cacheFp : string
+            The filepath of the cache file
+
+        Returns
+        -------
+        tuple
+            The index strings and values of the cache entry, or None
+            if the entry does not exist or cannot be read
+        '''
+
+        if not os.path.exists(cacheFp):
+            return None
+
+        try:
+            # Writers publish entries atomically via os.replace, so a
+            # plain read never sees a partially written file.
+            with open(cacheFp, 'rb') as f:
+                cached = np.load(f, allow_pickle=False)
+                idx = cached["idx"]
+                values = cached["values"].astype(np.float32)
+
+                # Undo the scale/offset quantization of "q16" entries
+                if "scale" in cached:
+                    values = values * cached["scale"] + cached["vmin"]
+
+        except Exception as err:
+            print("Could not read cache file {fp}: {err}".format(fp = cacheFp, err = err))
+            return None
+
+        return [str(i) for i in idx], list(values)
+
+
+    # Per variable storage dtype of the value cache. The known
+    # variables are stored as scale/offset uint16: the per entry value
+    # range spans at most a few ten units, so the round trip error
+    # stays far below sensor error. Raw float16 would not do for
+    # t_2m - absolute Kelvin values sit in the [256, 512) binade
+    # where float16 spacing is 0.25 K. Unknown variables stay float32.
+    _CACHE_DTYPES = {
+        "t_2m": "q16",
+        "aswdir_s": "q16",
+        "aswdifd_s": "q16"
+    }
+
+    def _writeCache(self, cacheFp, idxList, vals, var = None):
+
+        '''Writes the extracted values of one grib file to the cache,
+        quantized according to the per variable dtype policy.
+
+        Parameters
+        ----------
+        cacheFp : string
+            The filepath of the cache file
+        idxList : list
+            The index strings of the extracted values
+        vals : list
+            The extracted values
+        var : string
+            The variable name, used to pick the storage dtype
+        '''
+
+        arr = np.asarray(vals, dtype = np.float32)
+        policy = self._CACHE_DTYPES.get(var)
+
+        entry = {"idx": np.array(idxList, dtype = str)}
+
+        if policy == "f2":
+            entry["values"] = arr.astype(np.float16)
+
+        elif policy == "q16" and arr.size > 0:
+            vmin = float(arr.min())
+            scale = (float(arr.max()) - vmin) / 65535.0
+
+            if scale == 0.0:
+                scale = 1.0
+
+            entry["values"] = np.round((arr - vmin) / scale).astype(np.uint16)
+            entry["scale"] = np.float32(scale)
+            entry["vmin"] = np.float32(vmin)
+
+        else:
+            entry["values"] = arr
+
+        try:
+            # Write to a sibling temp file and publish it atomically,
+            # so concurrent readers only ever see complete entries.
+            tmpFp = "{fp}.{pid}.tmp".format(fp = cacheFp, pid = os.getpid())
+            with open(tmpFp, 'wb') as f:
+                np.savez_compressed(f, **entry)
+            os.replace(tmpFp, cacheFp)
+        except Exception as err:
+            print("Could not write cache file {fp}: {err}".format(fp = cacheFp, err = err))
+
+
     def createDownloadUrl(self, var):
 
         '''Creates the download urls
@@ -147,22 +499,14 @@ class ICON_D2:
         '''
     
         currentRun = self._currentRun
-        now_utc = datetime.now(timezone.utc)
-        
-        if currentRun == "21":
-            now_utc = now_utc - timedelta(days=1) 
-        
-        urlDate = now_utc.strftime("%Y%m%d") 
+        urlDate = self._getRunDate()
 
-        url = "{src}{run}/{var}".format(src = self._src, var = var, run = self._currentRun) 
-        
-        hours = self._forecastHours
+        url = "{src}{run}/{var}".format(src = self._src, var = var, run = self._currentRun)
         
-        if self._forecastHours is None:
-            hours = 49
-         
+        hourLo, hourHi = self._forecastWindow()
+
         urls = []
-        for h in range(hours):
+        for h in range(hourLo, hourHi):
             
             hStr = str(h).zfill(2)
             fileName = "icon-d2_germany_regular-lat-lon_single-level_{ds}{run}_0{h}_2d_{var}.grib2.bz2".format(h = hStr,
@@ -176,147 +520,862 @@ class ICON_D2:
         return urls
     
     
-    def downloadAndExtractBzFile(self, url, destFp):
+    def _storeParts(self, parts):
+
+        '''Stores the decompressed chunks in a shared memory block, so
+        consumers in other processes can attach to the buffer instead
+        of re-reading and re-decoding it. The chunks are copied into
+        place one by one, so no joined full-size intermediate is built.
 
-        '''Downloads the file from an url und extracts the content.
-        
         Parameters
         ----------
-        url : string
-            The url for the file to download
-        destFp : string 
-            The path to save the file. Should be a tmp path.
+        parts : list
+            The decompressed chunks
+
+        Returns
+        -------
+        tuple
+            The name of the shared memory block and the buffer size
         '''
-        
-        try:
-            r = requests.get(url)
-            if r.status_code == 200:
-                with open(destFp, 'wb') as f:
-                    f.write(decompress(r.content))
-                
-        except Exception as err:
-            print("Could not get {url}: {err}".format(err = err, url = url))        
 
+        size = sum(len(p) for p in parts)
+
+        shm = shared_memory.SharedMemory(create = True, size = size)
+
+        offset = 0
+        for p in parts:
+            shm.buf[offset:offset + len(p)] = p
+            offset += len(p)
+
+        shm.close()
+
+        return shm.name, size
+
+
+    async def _readDecompressed(self, r):
+
+        '''Streams the response body through the bz2 decompressor
+        chunk by chunk, so the full compressed file is never held in
+        memory and decompression overlaps with the network transfer.
 
-    def _getVarnameFromNcFile(self, ncFile):
-        
-        '''Extracts the nc intern weather variable name from the netCDF file
-        
         Parameters
         ----------
-        ncFile : xarray
-            The netCDF file
-            
+        r : aiohttp.ClientResponse
+            The open response to read from
+
         Returns
         -------
-        string
-            The nc intern weather variable name
-        ''' 
-        
-        var = None
-        
-        for var in ncFile.variables:
-            
-            varDims = len(ncFile.variables[var].shape)
-            
-            if varDims >= 2:
-                ncVarName = var
-        
-        return ncVarName
+        tuple
+            The name of the shared memory block and the buffer size
+        '''
 
+        decompressor = BZ2Decompressor()
+        parts = []
 
-    def extractValuesFromGrib(self, fp, data):
-        
-        '''Extract the value from the grib file for the locations.
-        
-        Parameters
-        ----------
-        fp : string
-            The filepath to the netCDF file
-        data : pd.Series
-            The series is given by reference and will be filled
-            iteratively.
-        '''   
-        
-        ncFile = xr.open_dataset(fp, engine='cfgrib')
-        ncVarName = self._getVarnameFromNcFile(ncFile)
-        stepValues = ncFile.step.values
-        hasStepIndex = True
-        
-        if not isinstance(stepValues, Iterable):
-            stepValues = [stepValues]
-            hasStepIndex = False
-                    
-        for locName, coords in self.locations.items():
-            
-            lat = coords["lat"]
-            lon = coords["lon"] 
-        
-            for step in stepValues:
-                
-                if hasStepIndex is True:
-                    nearestPointVal = ncFile.sel(step = step,
-                                                 latitude=lat, 
-                                                 longitude=lon, 
-                                                 method="nearest")[ncVarName].values
-                else:
-                    nearestPointVal = ncFile.sel(latitude=lat, 
-                                                 longitude=lon, 
-                                                 method="nearest")[ncVarName].values
-                    
-                dt_forecast = ncFile.time.values + step
-                
-                idx = "{n},{t},{de}".format(n = locName, t = ncFile.time.values, de = dt_forecast)
-                
-                data.loc[idx] = np.float32(nearestPointVal)
-                
-        os.remove(fp)
-    
-    
-    def mainDataCollector(self, iterItem):
+        async for chunk in r.content.iter_chunked(65536):
+            parts.append(await asyncio.to_thread(decompressor.decompress, chunk))
+
+        return await asyncio.to_thread(self._storeParts, parts)
+
+
+    def _rawCacheFps(self, url):
+
+        '''Creates the filepaths of the raw cache entry for an url.
+        The raw cache keeps the decompressed grib content per url
+        together with its Last-Modified header, so a later request for
+        the same file, e.g. with different locations, can revalidate
+        with a conditional GET instead of re-downloading the body.
 
-        '''Collects the data for all timesteps for one variable
-        
         Parameters
         ----------
-        iterItem : tuple
-            Tuple with variable key and variable value
- 
+        url : string
+            The url of the file
+
         Returns
         -------
-        dict
-            The collected data
+        tuple
+            The filepath of the raw content and of the Last-Modified
+            sidecar
         '''
-        data = pd.Series()        
-        
-        urls = self.createDownloadUrl(iterItem) # url for one variable
-        
-        for url in urls:
-    
-            print("ICON data -> Processing file: {f}".format(f = url))                
-    
-            tmpfn = os.path.basename(url) # tmp file name
-            tmpfn = Path(tmpfn).with_suffix('')
-            tmpfp = "{p}/{tmpfn}".format(tmpfn = tmpfn, p = self._tmpFp) # tmp file path
-            
-            # Download the zip file and save it temporarely
-            self.downloadAndExtractBzFile(url, tmpfp)
-            
-            # Extract values from grib file
-            try:
-                self.extractValuesFromGrib(tmpfp, data)
-            except Exception as err:
-                print("ERROR Can't extract values from grib file: {e}".format(e = err))
-        
 
-        idx_s = data.index.str.split(",")
-        idx_t = [(list(x)[0], np.datetime64(list(x)[1]), np.datetime64(list(x)[2])) for x in idx_s]
-        data.index = pd.MultiIndex.from_tuples(idx_t, names=["location", "dt_forecast_init", "dt_forecast"])
-        
-        data = data.rename(iterItem)
+        key = hashlib.blake2b(url.encode()).hexdigest()
 
-        return data
-    
+        rawFp = "{p}/{key}.grib".format(p = self._cacheFp, key = key)
+        lmFp = "{p}/{key}.lm".format(p = self._cacheFp, key = key)
+
+        return rawFp, lmFp
+
+
+    def _loadRawCache(self, rawFp):
+
+        '''Loads a raw cache entry into shared memory.
+
+        Parameters
+        ----------
+        rawFp : string
+            The filepath of the raw content
+
+        Returns
+        -------
+        tuple
+            The name of the shared memory block and the buffer size
+        '''
+
+        with open(rawFp, 'rb') as f:
+            return self._storeParts([f.read()])
+
+
+    def _storeRawCache(self, rawFp, lmFp, shmName, size, lastModified):
+
+        '''Writes a downloaded buffer and its Last-Modified header to
+        the raw cache.
+
+        Parameters
+        ----------
+        rawFp : string
+            The filepath of the raw content
+        lmFp : string
+            The filepath of the Last-Modified sidecar
+        shmName : string
+            The name of the shared memory block holding the content
+        size : int
+            The size of the content
+        lastModified : string
+            The Last-Modified header of the response, may be None
+        '''
+
+        if lastModified is None:
+            return
+
+        try:
+            shm = shared_memory.SharedMemory(name = shmName)
+
+            try:
+                with open(rawFp, 'wb') as f:
+                    f.write(shm.buf[:size])
+            finally:
+                shm.close()
+
+            with open(lmFp, 'w') as f:
+                f.write(lastModified)
+
+        except Exception as err:
+            print("Could not write raw cache {fp}: {err}".format(fp = rawFp, err = err))
+
+
+    async def _fetchBuffer(self, session, sem, url):
+
+        '''Downloads one file into shared memory with retries and
+        conditional revalidation against the raw cache. If the server
+        answers 304 the already stored body is reused, skipping the
+        transfer entirely.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            The shared http session
+        sem : asyncio.Semaphore
+            Semaphore to bound the number of concurrent downloads
+        url : string
+            The url for the file to download
+
+        Returns
+        -------
+        tuple
+            The (shared memory name, size) of the decompressed
+            content, or None if the file is not available
+        '''
+
+        rawFp, lmFp = self._rawCacheFps(url)
+        headers = {}
+
+        if os.path.exists(rawFp) and os.path.exists(lmFp):
+            with open(lmFp) as f:
+                headers["If-Modified-Since"] = f.read().strip()
+
+        for attempt in range(3):
+
+            try:
+                async with sem:
+                    async with session.get(url, headers = headers) as r:
+
+                        if r.status == 304:
+                            return await asyncio.to_thread(self._loadRawCache, rawFp)
+
+                        if r.status >= 500:
+                            # Transient server errors go through the
+                            # retry loop like connection failures.
+                            raise aiohttp.ClientResponseError(
+                                r.request_info, r.history,
+                                status = r.status, message = r.reason)
+
+                        if r.status != 200:
+                            # 404 etc.: the file is not published,
+                            # retrying will not help.
+                            return None
+
+                        shmName, size = await self._readDecompressed(r)
+
+                        await asyncio.to_thread(self._storeRawCache, rawFp, lmFp,
+                                                shmName, size,
+                                                r.headers.get("Last-Modified"))
+
+                        return shmName, size
+
+            except Exception as err:
+
+                if attempt == 2:
+                    print("Could not get {url}: {err}".format(err = err, url = url))
+                    return None
+
+                await asyncio.sleep(0.5 * 2 ** attempt)
+
+
+    async def _fetchAndExtractBzFile(self, session, sem, url, buffers):
+
+        '''Downloads one file from an url and extracts the content.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            The shared http session
+        sem : asyncio.Semaphore
+            Semaphore to bound the number of concurrent downloads
+        url : string
+            The url for the file to download
+        buffers : dict
+            Maps the url to the (shared memory name, size) of the
+            decompressed content. Given by reference and filled.
+        '''
+
+        res = await self._fetchBuffer(session, sem, url)
+
+        if res is not None:
+            buffers[url] = res
+
+
+    async def _downloadAll(self, urls, buffers):
+
+        '''Downloads and extracts all files concurrently.
+
+        Parameters
+        ----------
+        urls : list
+            The urls of the files to download
+        buffers : dict
+            Maps each url to its decompressed shared memory buffer.
+            Given by reference and filled.
+        '''
+
+        sem = asyncio.Semaphore(16)
+        connector = aiohttp.TCPConnector(limit = 16, keepalive_timeout = 30)
+
+        async with aiohttp.ClientSession(connector = connector) as session:
+            tasks = [self._fetchAndExtractBzFile(session, sem, url, buffers)
+                     for url in urls]
+            await asyncio.gather(*tasks)
+
+
+    def downloadAndExtractBzFiles(self, urls):
+
+        '''Downloads the files from the urls und extracts the contents
+        into shared memory. The downloads run concurrently so the
+        wall-clock time is bound by the slowest file instead of the sum
+        of all round trips.
+
+        Parameters
+        ----------
+        urls : list
+            The urls of the files to download
+
+        Returns
+        -------
+        dict
+            Maps each url to the (shared memory name, size) of its
+            decompressed content
+        '''
+
+        buffers = {}
+        asyncio.run(self._downloadAll(urls, buffers))
+
+        return buffers
+
+
+    @staticmethod
+    def _getGridMeta(gid):
+
+        '''Reads the regular lat/lon grid definition from a grib message.
+
+        Parameters
+        ----------
+        gid : int
+            The eccodes handle of the grib message
+
+        Returns
+        -------
+        dict
+            The grid origin, increments and dimensions
+        '''
+
+        meta = {
+            "nlat": eccodes.codes_get(gid, 'Nj'),
+            "nlon": eccodes.codes_get(gid, 'Ni'),
+            "lat0": eccodes.codes_get(gid, 'latitudeOfFirstGridPointInDegrees'),
+            "lon0": eccodes.codes_get(gid, 'longitudeOfFirstGridPointInDegrees'),
+            "dlat": eccodes.codes_get(gid, 'jDirectionIncrementInDegrees'),
+            "dlon": eccodes.codes_get(gid, 'iDirectionIncrementInDegrees')
+        }
+
+        if not eccodes.codes_get(gid, 'jScansPositively'):
+            meta["dlat"] = -meta["dlat"]
+
+        return meta
+
+
+    @staticmethod
+    def _flatIndexFromMeta(meta, lats, lons):
+
+        '''Computes the flat grid index of the nearest grid point for
+        each location. On the regular lat/lon grid the nearest index is
+        closed form, so this needs to be done only once per grid.
+
+        Parameters
+        ----------
+        meta : dict
+            The grid definition as returned by _getGridMeta
+        lats : np.ndarray
+            The latitudes of the locations
+        lons : np.ndarray
+            The longitudes of the locations
+
+        Returns
+        -------
+        np.ndarray
+            The flat index into the grib values array for each location
+        '''
+
+        i = np.round((lats - meta["lat0"]) / meta["dlat"]).astype(np.int64)
+        j = np.round((lons - meta["lon0"]) / meta["dlon"]).astype(np.int64)
+
+        i = np.clip(i, 0, meta["nlat"] - 1)
+        j = np.clip(j, 0, meta["nlon"] - 1)
+
+        return i * meta["nlon"] + j
+
+
+    @classmethod
+    def _gridMetaFor(cls, gid):
+
+        '''Returns the cached grid definition, reading it from the
+        message only once per process.
+
+        Parameters
+        ----------
+        gid : int
+            The eccodes handle of the grib message
+
+        Returns
+        -------
+        dict
+            The grid origin, increments and dimensions
+        '''
+
+        if cls._gridMeta is None:
+            cls._gridMeta = cls._getGridMeta(gid)
+
+        return cls._gridMeta
+
+
+    @staticmethod
+    def _metaKey(meta):
+
+        '''Packs the grid definition into a hashable cache key.
+
+        Parameters
+        ----------
+        meta : dict
+            The grid definition as returned by _getGridMeta
+
+        Returns
+        -------
+        tuple
+            The grid definition values
+        '''
+
+        return (meta["nlat"], meta["nlon"], meta["lat0"],
+                meta["lon0"], meta["dlat"], meta["dlon"])
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize = 4)
+    def _cachedFlatIndex(metaKey, latKey, lonKey):
+
+        '''Memoized flat grid index for one grid and locations set.
+        Repeated queries for the same locations within a process, e.g.
+        one per variable and run, reuse the index instead of
+        recomputing it per grib file.
+
+        Parameters
+        ----------
+        metaKey : tuple
+            The grid definition as returned by _metaKey
+        latKey : tuple
+            The latitudes of the locations
+        lonKey : tuple
+            The longitudes of the locations
+
+        Returns
+        -------
+        np.ndarray
+            The flat index into the grib values array for each location
+        '''
+
+        meta = dict(zip(("nlat", "nlon", "lat0", "lon0", "dlat", "dlon"), metaKey))
+
+        return ICON_D2._flatIndexFromMeta(meta, np.array(latKey), np.array(lonKey))
+
+
+    def _computeFlatIndex(self, gid, lats, lons):
+
+        '''Computes the flat grid index for the locations through the
+        per process caches.
+
+        Parameters
+        ----------
+        gid : int
+            The eccodes handle of the grib message
+        lats : np.ndarray
+            The latitudes of the locations
+        lons : np.ndarray
+            The longitudes of the locations
+
+        Returns
+        -------
+        np.ndarray
+            The flat index into the grib values array for each location
+        '''
+
+        meta = self._gridMetaFor(gid)
+
+        return self._cachedFlatIndex(self._metaKey(meta), tuple(lats), tuple(lons))
+
+
+    @staticmethod
+    def _gribDatetime(dateVal, timeVal):
+
+        '''Builds a datetime from the grib date and time keys.
+
+        Parameters
+        ----------
+        dateVal : int
+            The date as YYYYMMDD
+        timeVal : int
+            The time as HHMM
+
+        Returns
+        -------
+        np.datetime64
+            The combined datetime
+        '''
+
+        dtStr = "{d:08d}{t:04d}".format(d = dateVal, t = timeVal)
+
+        return np.datetime64(datetime.strptime(dtStr, "%Y%m%d%H%M"))
+
+
+    def _getLocationArrays(self, locations):
+
+        '''Packs the locations into coordinate arrays for
+        vectorized indexing.
+
+        Parameters
+        ----------
+        locations : dict
+            The locations to pack
+
+        Returns
+        -------
+        tuple
+            The location names as a list and the latitudes and
+            longitudes as np.ndarray
+        '''
+
+        locNames = list(locations.keys())
+        lats = np.array([locations[n]["lat"] for n in locNames])
+        lons = np.array([locations[n]["lon"] for n in locNames])
+
+        return locNames, lats, lons
+
+
+    @staticmethod
+    def _extractBuffer(buf, locNames, lats, lons, flatIdx = None):
+
+        '''Extract the values from a decompressed grib buffer for the
+        locations. The messages are decoded in memory with the low
+        level eccodes api, so only the grid cells of the locations are
+        pulled out of the values array instead of materializing a full
+        coordinate system per file.
+
+        Parameters
+        ----------
+        buf : bytes
+            The decompressed grib file content
+        locNames : list
+            The location names
+        lats : np.ndarray
+            The latitudes of the locations
+        lons : np.ndarray
+            The longitudes of the locations
+        flatIdx : np.ndarray
+            The precomputed flat grid index. Computed from the first
+            message if not given.
+
+        Returns
+        -------
+        tuple
+            The index strings, the extracted values and the flat
+            grid index
+        '''
+
+        msgVals = []
+        msgTimes = []
+        offset = 0
+
+        while offset < len(buf):
+
+            gid = eccodes.codes_new_from_message(bytes(buf[offset:]))
+
+            try:
+                if flatIdx is None:
+                    meta = ICON_D2._gridMetaFor(gid)
+                    flatIdx = ICON_D2._cachedFlatIndex(ICON_D2._metaKey(meta),
+                                                       tuple(lats), tuple(lons))
+
+                msgVals.append(eccodes.codes_get_double_array(gid, 'values'))
+
+                dt_init = ICON_D2._gribDatetime(eccodes.codes_get(gid, 'dataDate'),
+                                                eccodes.codes_get(gid, 'dataTime'))
+                dt_forecast = ICON_D2._gribDatetime(eccodes.codes_get(gid, 'validityDate'),
+                                                    eccodes.codes_get(gid, 'validityTime'))
+                msgTimes.append((dt_init, dt_forecast))
+
+                offset += eccodes.codes_get(gid, 'totalLength')
+
+            finally:
+                eccodes.codes_release(gid)
+
+        idxList = []
+        vals = []
+
+        if msgVals:
+
+            # One compiled gather over all (step, location) cells of
+            # the buffer instead of a python loop per message
+            values2d = np.stack(msgVals)
+            out = np.empty((values2d.shape[0], flatIdx.size), dtype = np.float32)
+            _gather(values2d, np.asarray(flatIdx), out)
+
+            for s, (dt_init, dt_forecast) in enumerate(msgTimes):
+
+                for pt, locName in enumerate(locNames):
+
+                    idxList.append("{n},{t},{de}".format(n = locName, t = dt_init, de = dt_forecast))
+                    vals.append(out[s, pt])
+
+        return idxList, vals, flatIdx
+
+
+    def extractValuesFromMessages(self, buf, locNames, lats, lons):
+
+        '''Extract the values from a decompressed grib buffer for the
+        locations, caching the flat grid index on the instance.
+
+        Parameters
+        ----------
+        buf : bytes
+            The decompressed grib file content
+        locNames : list
+            The location names
+        lats : np.ndarray
+            The latitudes of the locations
+        lons : np.ndarray
+            The longitudes of the locations
+
+        Returns
+        -------
+        tuple
+            The index strings and the extracted values
+        '''
+
+        idxList, vals, self._flatIdx = self._extractBuffer(buf, locNames, lats, lons,
+                                                           self._flatIdx)
+
+        return idxList, vals
+
+
+    def mainDataCollector(self, iterItem):
+
+        '''Collects the data for all timesteps for one variable
+        and one set of locations
+
+        Parameters
+        ----------
+        iterItem : tuple
+            Tuple with the variable name and the locations dict
+
+        Returns
+        -------
+        dict
+            The collected data
+        '''
+        var, locations = iterItem
+
+        self._flatIdx = None # the flat index is only valid per locations set
+
+        urls = self.createDownloadUrl(var) # url for one variable
+
+        locNames, lats, lons = self._getLocationArrays(locations)
+
+        hourLo, hourHi = self._forecastWindow()
+
+        idxAll = []
+        valsAll = []
+        downloadUrls = []
+        cacheFps = []
+
+        for h, url in zip(range(hourLo, hourHi), urls):
+
+            hStr = str(h).zfill(2)
+            cacheFp = self._createCacheFp(var, hStr, locations)
+
+            # Values already extracted for this run, variable and hour
+            cached = self._readCache(cacheFp)
+
+            if cached is not None:
+                idxAll.extend(cached[0])
+                valsAll.extend(cached[1])
+                continue
+
+            downloadUrls.append(url)
+            cacheFps.append(cacheFp)
+
+        # Download the zip files concurrently into shared memory
+        buffers = self.downloadAndExtractBzFiles(downloadUrls)
+
+        for url, cacheFp in zip(downloadUrls, cacheFps):
+
+            print("ICON data -> Processing file: {f}".format(f = url))
+
+            if url not in buffers:
+                continue
+
+            shmName, size = buffers[url]
+            shm = shared_memory.SharedMemory(name = shmName)
+
+            # Extract values from the grib messages
+            try:
+                idxList, vals = self.extractValuesFromMessages(shm.buf[:size],
+                                                               locNames, lats, lons)
+            except Exception as err:
+                print("ERROR Can't extract values from grib messages: {e}".format(e = err))
+                continue
+            finally:
+                shm.close()
+                shm.unlink()
+
+            self._writeCache(cacheFp, idxList, vals, var)
+
+            idxAll.extend(idxList)
+            valsAll.extend(vals)
+
+        data = pd.Series(np.asarray(valsAll, dtype = np.float32), index = idxAll)
+
+        return self._finalizeSeries(data, var)
+
+
+    def _finalizeSeries(self, data, var):
+
+        '''Converts the flat string index of a collected series into
+        the (location, init, forecast) multi index.
+
+        Parameters
+        ----------
+        data : pd.Series
+            The collected data with the flat string index
+        var : string
+            The variable name the series is renamed to
+
+        Returns
+        -------
+        pd.Series
+            The series with the multi index
+        '''
+
+        idx_s = data.index.str.split(",")
+        idx_t = [(list(x)[0], np.datetime64(list(x)[1]), np.datetime64(list(x)[2])) for x in idx_s]
+        data.index = pd.MultiIndex.from_tuples(idx_t, names=["location", "dt_forecast_init", "dt_forecast"])
+
+        return data.rename(var)
+
+
+    async def _fetchToQueue(self, session, sem, url, q):
+
+        '''Downloads one file, decompresses it into shared memory and
+        feeds it to the decode queue.
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            The shared http session
+        sem : asyncio.Semaphore
+            Semaphore to bound the number of concurrent downloads
+        url : string
+            The url for the file to download
+        q : queue.Queue
+            The bounded decode queue
+        '''
+
+        res = await self._fetchBuffer(session, sem, url)
+
+        if res is not None:
+            shmName, size = res
+            await asyncio.to_thread(q.put, (url, shmName, size))
+
+
+    async def _downloadToQueue(self, urls, q):
+
+        '''Downloads all files concurrently into the decode queue.
+
+        Parameters
+        ----------
+        urls : list
+            The urls of the files to download
+        q : queue.Queue
+            The bounded decode queue
+        '''
+
+        sem = asyncio.Semaphore(16)
+        connector = aiohttp.TCPConnector(limit = 16, keepalive_timeout = 30)
+
+        async with aiohttp.ClientSession(connector = connector) as session:
+            tasks = [self._fetchToQueue(session, sem, url, q)
+                     for url in urls]
+            await asyncio.gather(*tasks)
+
+
+    def _collectDataPipeline(self, jobs, cores):
+
+        '''Runs the jobs through a two stage download/decode pipeline.
+        An async downloader fills a bounded queue with shared memory
+        buffers while a process pool decodes them as they land, so the
+        network io overlaps with the eccodes cpu work instead of
+        running serially per job.
+
+        Parameters
+        ----------
+        jobs : list
+            Tuples with the variable name and the locations dict
+        cores : int
+            Number of decode workers
+
+        Returns
+        -------
+        list
+            One pd.Series per job with the multi index set
+        '''
+
+        jobStates = []
+
+        # Each unique url is fetched and decoded exactly once; the
+        # decode gathers all locations of its job in one pass.
+        urlConsumers = {}
+
+        for jobIdx, (var, locations) in enumerate(jobs):
+
+            idxAll = []
+            valsAll = []
+            locNames, lats, lons = self._getLocationArrays(locations)
+
+            urls = self.createDownloadUrl(var)
+            hourLo, hourHi = self._forecastWindow()
+
+            for h, url in zip(range(hourLo, hourHi), urls):
+
+                cacheFp = self._createCacheFp(var, str(h).zfill(2), locations)
+
+                # Values already extracted for this run, variable and hour
+                cached = self._readCache(cacheFp)
+
+                if cached is not None:
+                    idxAll.extend(cached[0])
+                    valsAll.extend(cached[1])
+                    continue
+
+                urlConsumers[url] = (jobIdx, cacheFp)
+
+            jobStates.append({"var": var, "idx": idxAll, "vals": valsAll,
+                              "locNames": locNames, "lats": lats, "lons": lons})
+
+        q = queue.Queue(maxsize = 8)
+
+        def producer():
+            try:
+                asyncio.run(self._downloadToQueue(list(urlConsumers), q))
+            finally:
+                q.put(None)
+
+        producerThread = threading.Thread(target = producer)
+
+        futures = []
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers = cores,
+                                                    initializer = _initEccodesWorker) as executor:
+
+            producerThread.start()
+
+            while True:
+
+                item = q.get()
+
+                if item is None:
+                    break
+
+                url, shmName, size = item
+
+                print("ICON data -> Processing file: {f}".format(f = url))
+
+                jobIdx, cacheFp = urlConsumers[url]
+
+                state = jobStates[jobIdx]
+                fut = executor.submit(_decodeSharedBuffer, shmName, size,
+                                      state["locNames"], state["lats"],
+                                      state["lons"])
+                futures.append((jobIdx, cacheFp, fut))
+
+            for jobIdx, cacheFp, fut in futures:
+
+                try:
+                    idxList, vals = fut.result()
+                except Exception as err:
+                    print("ERROR Can't extract values from grib messages: {e}".format(e = err))
+                    continue
+
+                self._writeCache(cacheFp, idxList, vals, jobStates[jobIdx]["var"])
+
+                jobStates[jobIdx]["idx"].extend(idxList)
+                jobStates[jobIdx]["vals"].extend(vals)
+
+        producerThread.join()
+
+        result = []
+
+        for state in jobStates:
+            data = pd.Series(np.asarray(state["vals"], dtype = np.float32),
+                             index = state["idx"])
+            result.append(self._finalizeSeries(data, state["var"]))
+
+        return result
+    
     
     
     def collectData(self, varList, cores = None):
@@ -346,38 +1405,230 @@ class ICON_D2:
 
     
         if cores is None:
-            
+
             result = []
-            
-            for item in varList:
-                res = self.mainDataCollector(item)  
+
+            for var in varList:
+                res = self.mainDataCollector((var, self._locations))
                 result.append(res)
-              
+
         else:
-            # Parallel processing of downloading and extracting grib data
-            pool = multiprocessing.Pool()
-            result = pool.map(self.mainDataCollector, varList)
-            pool.close()
-            pool.join()
-
-        # Collect thte data
-        data = pd.DataFrame()
+            # Parallel processing of downloading and extracting grib data.
+            # One job per variable; the pipeline parallelizes the decode
+            # over the individual files, so every file is decoded exactly
+            # once with the full locations gathered in one pass.
+            jobs = [(var, self._locations) for var in varList]
+
+            result = self._collectDataPipeline(jobs, cores)
+
+        # Collect the data
         data = pd.concat(result, axis=1)
 
         # Sort data
         data = data.sort_values(["location", "dt_forecast"])
 
-        # Remove all .idx files in the tmp folder
-        path = "{tfp}/*grib*".format(tfp = self._tmpFp)
-        fileList = glob.glob(path)
+        return data
 
-        for filePath in fileList:
-            try:
-                os.remove(filePath)
-            except:
-                print("Error while deleting file : ", filePath)
-        
-        return data        
-        
 
+    def _nextRunSwitch(self, now_utc):
+
+        '''Computes the next full hour at which a newer run becomes
+        fully available.
+
+        Parameters
+        ----------
+        now_utc : datetime
+            The current datetime
+
+        Returns
+        -------
+        datetime
+            The hour at which the run table advances
+        '''
+
+        current = self._RUN_BY_HOUR[now_utc.hour]
+        boundary = now_utc.replace(minute = 0, second = 0, microsecond = 0)
+
+        while True:
+
+            boundary += timedelta(hours = 1)
+
+            if self._RUN_BY_HOUR[boundary.hour] != current:
+                return boundary
+
+
+    def warmCache(self, varList):
+
+        '''Fills the value cache for the current run, the configured
+        locations and the given variables, and records a status file
+        in the cache folder so consumers can report which run the
+        cache is warmed for.
+
+        Parameters
+        ----------
+        varList : list
+            A list with variable names
+        '''
+
+        for var in varList:
+            self.mainDataCollector((var, self._locations))
+
+        status = {
+            "run": self._currentRun,
+            "runDate": self._getRunDate(),
+            "warmedAt": datetime.now(timezone.utc).isoformat(),
+            "variables": list(varList)
+        }
+
+        statusFp = "{p}/prefetch_status.json".format(p = self._cacheFp)
+
+        try:
+            with open(statusFp, 'w') as f:
+                json.dump(status, f)
+        except Exception as err:
+            print("Could not write prefetch status: {err}".format(err = err))
+
+
+    async def prefetchLoop(self, varList, margin = 600):
+
+        '''Warms the cache for each new run shortly after it
+        publishes, so the first request against a fresh run does not
+        pay the download latency. Long running consumers schedule this
+        once at startup, e.g. with asyncio.create_task.
+
+        Parameters
+        ----------
+        varList : list
+            A list with variable names
+        margin : int
+            Seconds to wait past the expected publication time
+        '''
+
+        while True:
+
+            now_utc = datetime.now(timezone.utc)
+            switch = self._nextRunSwitch(now_utc)
+
+            await asyncio.sleep((switch - now_utc).total_seconds() + margin)
+
+            self._getCurrentRun(datetime.now(timezone.utc))
+
+            await asyncio.to_thread(self.warmCache, varList)
+
+
+    @classmethod
+    def collectDataBatch(cls, locationSets, varList, forecastHours,
+                         run = None, tmpFp = None, cacheFp = None, cores = None):
+
+        '''Collects the data for several location sets in one pass.
+        Callers that would otherwise issue one collectData call per
+        route pay the full download cost each time; here the sets are
+        merged into a single union of locations, the grib files are
+        downloaded and decoded once, and the result is sliced back
+        per set afterwards.
+
+        Parameters
+        ----------
+        locationSets : dict
+            Maps a set name to a locations dict as accepted by the
+            constructor
+        varList : list
+            A list with variable names
+        forecastHours : int or tuple
+            The forecast hours for which the data is collected, either
+            a count or an (hourLo, hourHi) window
+        run : string
+            The name of the run to load forecast
+        tmpFp : string
+            Unused, kept for backward compatibility
+        cacheFp : string
+            The filepath to the cache folder
+        cores : int
+            Number of cores to use
+
+        Returns
+        -------
+        dict
+            Maps each set name to its data as a dataframe
+        '''
+
+        merged = {}
+        setLocNames = {}
+
+        for setName, locations in locationSets.items():
+
+            names = []
+
+            for locName, coords in locations.items():
+                mergedName = "{s}/{n}".format(s = setName, n = locName)
+                merged[mergedName] = coords
+                names.append(mergedName)
+
+            setLocNames[setName] = names
+
+        forecast = cls(locations = merged,
+                       forecastHours = forecastHours,
+                       run = run,
+                       tmpFp = tmpFp,
+                       cacheFp = cacheFp)
+
+        data = forecast.collectData(varList = varList, cores = cores)
+
+        results = {}
+
+        for setName, names in setLocNames.items():
+
+            prefix = "{s}/".format(s = setName)
+            mapping = {n: n[len(prefix):] for n in names}
+
+            results[setName] = data.loc[names].rename(index = mapping, level = "location")
+
+        return results
+
+
+def _initEccodesWorker():
+
+    '''Forces the eccodes library and its definition tables to load
+    once per decode worker instead of on the first decoded message.
+    '''
+
+    eccodes.codes_get_api_version()
+
+
+def _decodeSharedBuffer(shmName, size, locNames, lats, lons):
+
+    '''Decode worker of the download/decode pipeline. Attaches to the
+    shared memory buffer written by the downloader and extracts the
+    values for the locations.
+
+    Parameters
+    ----------
+    shmName : string
+        The name of the shared memory block
+    size : int
+        The size of the decompressed content
+    locNames : list
+        The location names
+    lats : np.ndarray
+        The latitudes of the locations
+    lons : np.ndarray
+        The longitudes of the locations
+
+    Returns
+    -------
+    tuple
+        The index strings and the extracted values
+    '''
+
+    shm = shared_memory.SharedMemory(name = shmName)
+
+    try:
+        buf = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    idxList, vals, _ = ICON_D2._extractBuffer(buf, locNames, lats, lons)
+
+    return idxList, vals
 
@@ -0,0 +1,93 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _toRecords(data):
+
+    '''Converts the collected dataframe into plain python records.
+    The values are converted in one bulk tolist() pass instead of per
+    cell attribute access, which dominates for many-point results.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The data as returned by ICON_D2.collectData
+
+    Returns
+    -------
+    list
+        One dict per (location, init, forecast) row
+    '''
+
+    variables = list(data.columns)
+    values = data.to_numpy().tolist()
+
+    records = []
+
+    for (loc, dtInit, dtForecast), row in zip(data.index, values):
+
+        records.append({
+            "location": loc,
+            "dt_forecast_init": str(dtInit),
+            "dt_forecast": str(dtForecast),
+            "values": dict(zip(variables, row))
+        })
+
+    return records
+
+
+def toJson(data):
+
+    '''Serializes the collected data to json bytes. Uses orjson when
+    installed, which is several times faster than the stdlib json for
+    large results, and falls back to the stdlib otherwise.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The data as returned by ICON_D2.collectData
+
+    Returns
+    -------
+    bytes
+        The json encoded records
+    '''
+
+    records = _toRecords(data)
+
+    if orjson is not None:
+        return orjson.dumps(records)
+
+    return json.dumps(records).encode()
+
+
+def toMsgpack(data):
+
+    '''Serializes the collected data to msgpack bytes, ~30% smaller
+    than json. Intended for internal consumers.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The data as returned by ICON_D2.collectData
+
+    Returns
+    -------
+    bytes
+        The msgpack encoded records
+    '''
+
+    if msgpack is None:
+        raise ImportError("msgpack is required for toMsgpack. "
+                          "Install with dwdGribExtractor[serialize].")
+
+    return msgpack.packb(_toRecords(data))
@@ -22,14 +22,14 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.8',
+    python_requires='>=3.9',
     install_requires=[
-        'requests>=2.25.1',
-        'multiprocess>=0.70.11.1',
-        'xarray>=0.16.2',
+        'aiohttp>=3.7.4',
         'pandas>=1.2.0',
-        'cfgrib>=0.9.9.0',
-        'eccodes>=1.2.0',
-        'netCDF4>=1.5.6' 
-    ]
+        'eccodes>=1.2.0'
+    ],
+    extras_require={
+        'speedups': ['numba>=0.53'],
+        'serialize': ['orjson>=3.5', 'msgpack>=1.0']
+    }
 )
\ No newline at end of file